@@ -2,39 +2,43 @@ import json
 import os
 import re
 
+# 清理事件名称时需要删除的字符（单引号、空格）
+CLEAN_NAME_TABLE = str.maketrans('', '', "' ")
+
 # 读取 event_encounters.json
 with open("../src-tauri/resources/event_encounters.json", 'r', encoding='utf-8') as f:
     events = json.load(f)
 
+# 一次性列出图片目录，避免每个事件都 stat 一次
+# 按小写文件名索引到磁盘上的实际文件名（与 Windows 上不区分大小写的 exists 一致，且路径使用实际大小写）；目录不存在时视为空
+char_dir = "../src-tauri/resources/EncEvent_CHAR"
+bg_dir = "../src-tauri/resources/EncEvent_BG"
+char_files = {e.name.lower(): e.name for e in os.scandir(char_dir)} if os.path.isdir(char_dir) else {}
+bg_files = {e.name.lower(): e.name for e in os.scandir(bg_dir)} if os.path.isdir(bg_dir) else {}
+
 # 更新每个有 choices 的事件
 updated_count = 0
 for event in events:
-    if 'choices' in event and event['choices']:
-        # 提取事件名称
-        name = None
-        if 'Localization' in event and 'Title' in event['Localization']:
-            name = event['Localization']['Title'].get('Text', '')
-        if not name:
-            name = event.get('InternalName', '')
-        
-        clean_name = name.split(' (')[0].strip().replace("'", "").replace(" ", "")
-        
-        # 构建图片路径
-        char_path = f"EncEvent_CHAR/ENC_Merchant_{clean_name}_Char.webp"
-        bg_path = f"EncEvent_BG/ENC_Merchant_{clean_name}_Bg.webp"
-        
-        # 检查文件是否存在
-        char_exists = os.path.exists(f"../src-tauri/resources/{char_path}")
-        bg_exists = os.path.exists(f"../src-tauri/resources/{bg_path}")
-        
-        # 添加图片路径到事件对象
-        event['image_paths'] = {}
-        if char_exists:
-            event['image_paths']['char'] = char_path
-        if bg_exists:
-            event['image_paths']['bg'] = bg_path
-        
-        updated_count += 1
+    if not event.get('choices'):
+        continue
+    
+    # 提取事件名称
+    title = (event.get('Localization') or {}).get('Title') or {}
+    name = title.get('Text', '') or event.get('InternalName', '')
+    
+    clean_name = name.split(' (', 1)[0].strip().translate(CLEAN_NAME_TABLE)
+    
+    # 只为实际存在的图片添加路径
+    image_paths = {}
+    char_file = char_files.get(f"ENC_Merchant_{clean_name}_Char.webp".lower())
+    if char_file:
+        image_paths['char'] = f"EncEvent_CHAR/{char_file}"
+    bg_file = bg_files.get(f"ENC_Merchant_{clean_name}_Bg.webp".lower())
+    if bg_file:
+        image_paths['bg'] = f"EncEvent_BG/{bg_file}"
+    event['image_paths'] = image_paths
+    
+    updated_count += 1
 
 # 保存更新后的 JSON
 with open("../src-tauri/resources/event_encounters.json", 'w', encoding='utf-8') as f:
@@ -1,39 +1,45 @@
 import json
 import os
 
+# 清理事件名称时需要删除的字符（单引号、空格）
+CLEAN_NAME_TABLE = str.maketrans('', '', "' ")
+
 # 读取 event_encounters.json
 with open("../src-tauri/resources/event_encounters.json", 'r', encoding='utf-8') as f:
     events = json.load(f)
 
+# 一次性列出图片目录，避免每个事件都 stat 一次
+# 按小写文件名索引到磁盘上的实际文件名（与 Windows 上不区分大小写的 exists 一致，且路径使用实际大小写）；目录不存在时视为空
+char_dir = "../src-tauri/resources/EncEvent_CHAR"
+bg_dir = "../src-tauri/resources/EncEvent_BG"
+char_files = {e.name.lower(): e.name for e in os.scandir(char_dir)} if os.path.isdir(char_dir) else {}
+bg_files = {e.name.lower(): e.name for e in os.scandir(bg_dir)} if os.path.isdir(bg_dir) else {}
+
 # 统计有 choices 的事件
 events_with_choices = []
 for event in events:
-    if 'choices' in event and event['choices']:
-        # 提取事件名称
-        name = None
-        if 'Localization' in event and 'Title' in event['Localization']:
-            name = event['Localization']['Title'].get('Text', '')
-        if not name:
-            name = event.get('InternalName', '')
-        
-        clean_name = name.split(' (')[0].strip().replace("'", "").replace(" ", "")
-        
-        # 构建图片路径
-        char_path = f"EncEvent_CHAR/ENC_Merchant_{clean_name}_Char.webp"
-        bg_path = f"EncEvent_BG/ENC_Merchant_{clean_name}_Bg.webp"
-        
-        # 检查文件是否存在
-        char_exists = os.path.exists(f"../src-tauri/resources/{char_path}")
-        bg_exists = os.path.exists(f"../src-tauri/resources/{bg_path}")
-        
-        events_with_choices.append({
-            'id': event.get('Id'),
-            'name': name,
-            'clean_name': clean_name,
-            'char_path': char_path if char_exists else None,
-            'bg_path': bg_path if bg_exists else None,
-            'choices_count': len(event['choices'])
-        })
+    choices = event.get('choices')
+    if not choices:
+        continue
+    
+    # 提取事件名称
+    title = (event.get('Localization') or {}).get('Title') or {}
+    name = title.get('Text', '') or event.get('InternalName', '')
+    
+    clean_name = name.split(' (', 1)[0].strip().translate(CLEAN_NAME_TABLE)
+    
+    # 检查文件是否存在（取磁盘上的实际文件名）
+    char_file = char_files.get(f"ENC_Merchant_{clean_name}_Char.webp".lower())
+    bg_file = bg_files.get(f"ENC_Merchant_{clean_name}_Bg.webp".lower())
+    
+    events_with_choices.append({
+        'id': event.get('Id'),
+        'name': name,
+        'clean_name': clean_name,
+        'char_path': f"EncEvent_CHAR/{char_file}" if char_file else None,
+        'bg_path': f"EncEvent_BG/{bg_file}" if bg_file else None,
+        'choices_count': len(choices)
+    })
 
 print(f"找到 {len(events_with_choices)} 个包含 choices 的事件\n")
 print("="*80)
@@ -1,47 +1,64 @@
+import io
 import os
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 
 # 路径配置
 char_dir = "../src-tauri/resources/EncEvent_CHAR"
 bg_dir = "../src-tauri/resources/EncEvent_BG"
 
+def init_worker():
+    """预先加载 Pillow 插件并预热 WebP 编码器，避免每个进程首张图时才初始化"""
+    Image.init()
+    Image.new('RGBA', (8, 8)).save(io.BytesIO(), 'WEBP', quality=80)
+
+def convert_file(png_path):
+    """转换单张PNG为WebP并删除原文件，返回错误信息（成功时为 None）"""
+    webp_path = os.path.splitext(png_path)[0] + '.webp'
+    try:
+        img = Image.open(png_path)
+        img.save(webp_path, 'WEBP', quality=80)
+        
+        # 删除原PNG文件
+        os.remove(png_path)
+        return None
+    except Exception as e:
+        return str(e)
+
 def convert_to_webp(directory):
     """转换目录中的所有PNG图片为WebP格式"""
     if not os.path.exists(directory):
         print(f"目录不存在: {directory}")
         return
     
+    filenames = [f for f in os.listdir(directory) if f.endswith('.png')]
+    png_paths = [os.path.join(directory, f) for f in filenames]
+    
+    # WebP 编码是 CPU 密集型，分发到多个进程并行处理
     converted_count = 0
-    for filename in os.listdir(directory):
-        if filename.endswith('.png'):
-            png_path = os.path.join(directory, filename)
-            webp_path = os.path.join(directory, filename.replace('.png', '.webp'))
-            
-            try:
-                img = Image.open(png_path)
-                img.save(webp_path, 'WEBP', quality=80)
+    with ProcessPoolExecutor(initializer=init_worker) as executor:
+        for filename, error in zip(filenames, executor.map(convert_file, png_paths)):
+            if error is None:
                 print(f"✓ 转换: {filename} -> {filename.replace('.png', '.webp')}")
                 converted_count += 1
-                
-                # 删除原PNG文件
-                os.remove(png_path)
-            except Exception as e:
-                print(f"✗ 转换失败 {filename}: {e}")
+            else:
+                print(f"✗ 转换失败 {filename}: {error}")
     
     return converted_count
 
-print("="*60)
-print("转换 Char 图片...")
-print("="*60)
-char_count = convert_to_webp(char_dir)
-
-print("\n" + "="*60)
-print("转换 Bg 图片...")
-print("="*60)
-bg_count = convert_to_webp(bg_dir)
-
-print("\n" + "="*60)
-print(f"转换完成！")
-print(f"  Char: {char_count} 个")
-print(f"  Bg: {bg_count} 个")
-print("="*60)
+if __name__ == "__main__":
+    print("="*60)
+    print("转换 Char 图片...")
+    print("="*60)
+    char_count = convert_to_webp(char_dir)
+    
+    print("\n" + "="*60)
+    print("转换 Bg 图片...")
+    print("="*60)
+    bg_count = convert_to_webp(bg_dir)
+    
+    print("\n" + "="*60)
+    print(f"转换完成！")
+    print(f"  Char: {char_count} 个")
+    print(f"  Bg: {bg_count} 个")
+    print("="*60)
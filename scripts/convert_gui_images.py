@@ -1,15 +1,40 @@
 from PIL import Image
+from concurrent.futures import ProcessPoolExecutor
+import io
 import os
 
-# 转换images_GUI目录下的所有PNG到WebP
 gui_dir = "../src-tauri/resources/images_GUI"
-for filename in os.listdir(gui_dir):
-    if filename.endswith('.png'):
-        png_path = os.path.join(gui_dir, filename)
-        webp_path = os.path.join(gui_dir, filename.replace('.png', '.webp'))
-        
+
+def init_worker():
+    """预先加载 Pillow 插件并预热 WebP 编码器，避免每个进程首张图时才初始化"""
+    Image.init()
+    Image.new('RGBA', (8, 8)).save(io.BytesIO(), 'WEBP', quality=80)
+
+def convert_file(filename):
+    """转换单张PNG为WebP，返回错误信息（成功时为 None）"""
+    png_path = os.path.join(gui_dir, filename)
+    webp_path = os.path.join(gui_dir, filename.replace('.png', '.webp'))
+    
+    try:
         img = Image.open(png_path)
         img.save(webp_path, 'WEBP', quality=80)
-        print(f"Converted {filename} to WebP")
+        return None
+    except Exception as e:
+        return str(e)
 
-print("All images converted successfully!")
+if __name__ == "__main__":
+    # 转换images_GUI目录下的所有PNG到WebP（多进程并行编码）
+    filenames = [f for f in os.listdir(gui_dir) if f.endswith('.png')]
+    failed = []
+    with ProcessPoolExecutor(initializer=init_worker) as executor:
+        for filename, error in zip(filenames, executor.map(convert_file, filenames)):
+            if error is None:
+                print(f"Converted {filename} to WebP")
+            else:
+                print(f"Failed to convert {filename}: {error}")
+                failed.append(filename)
+    
+    if failed:
+        print(f"{len(failed)} image(s) failed to convert.")
+    else:
+        print("All images converted successfully!")
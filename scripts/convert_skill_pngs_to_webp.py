@@ -1,28 +1,70 @@
 from PIL import Image
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import argparse
+import io
 import sys
 
 SRC = Path.cwd() / 'src-tauri' / 'resources' / 'images' / 'skill'
-if not SRC.exists():
-    print('Source dir not found:', SRC)
-    sys.exit(1)
-
-count = 0
-converted = 0
-errors = []
-for p in SRC.glob('*.png'):
-    count += 1
+
+
+def init_worker():
+    """预先加载 Pillow 插件并预热 WebP 编码器，避免每个进程首张图时才初始化"""
+    Image.init()
+    Image.new('RGBA', (8, 8)).save(io.BytesIO(), 'WEBP', quality=80)
+
+
+def convert_one(p, method=4):
+    """转换单个 PNG 为 WebP，返回错误信息（成功时为 None）"""
     out = p.with_suffix('.webp')
     try:
         im = Image.open(p).convert('RGBA')
-        im.save(out, 'WEBP', quality=80, method=6)
-        converted += 1
+        im.save(out, 'WEBP', quality=80, method=method)
+        return None
     except Exception as e:
-        errors.append((str(p), str(e)))
-
-print('PNG count:', count)
-print('Converted:', converted)
-print('Errors:', len(errors))
-if errors:
-    for e in errors:
-        print(e)
+        return str(e)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--method', type=int, default=4, choices=range(7),
+                    help='WebP encoder effort (0-6); 6 is smallest but several times slower')
+    ap.add_argument('--force', action='store_true',
+                    help='re-encode even when an up-to-date .webp already exists')
+    args = ap.parse_args()
+
+    if not SRC.exists():
+        print('Source dir not found:', SRC)
+        sys.exit(1)
+
+    files = list(SRC.glob('*.png'))
+
+    # 跳过已有且比源文件新的 WebP，使重复运行只处理新增/修改的图标
+    todo = []
+    skipped = 0
+    for p in files:
+        out = p.with_suffix('.webp')
+        if not args.force and out.exists() and out.stat().st_mtime >= p.stat().st_mtime:
+            skipped += 1
+        else:
+            todo.append(p)
+
+    # WebP 编码是 CPU 密集型，按核数分发到多个进程
+    errors = []
+    with ProcessPoolExecutor(initializer=init_worker) as ex:
+        for p, err in zip(todo, ex.map(partial(convert_one, method=args.method), todo, chunksize=8)):
+            if err is not None:
+                errors.append((str(p), err))
+
+    print('PNG count:', len(files))
+    print('Skipped (up to date):', skipped)
+    print('Converted:', len(todo) - len(errors))
+    print('Errors:', len(errors))
+    if errors:
+        for e in errors:
+            print(e)
+
+
+if __name__ == '__main__':
+    main()
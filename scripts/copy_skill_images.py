@@ -1,5 +1,6 @@
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 import shutil
 
@@ -8,7 +9,32 @@ SKILLS = WORK / 'src-tauri' / 'resources' / 'skills_db.json'
 ASSETS_ROOT = Path('D:/TheBazaarData/Assets/Texture2D')
 DEST = WORK / 'src-tauri' / 'resources' / 'images' / 'skill'
 
-EXT_TRY = ['.png', '.PNG', '.tga', '.TGA', '.dds', '.DDS', '.jpg', '.jpeg', '.JPG', '.JPEG']
+# in priority order; names are matched lowercased, so only lowercase suffixes are needed
+EXT_TRY = ('.png', '.tga', '.dds', '.jpg', '.jpeg')
+
+
+def scan_dir(path):
+    """List one directory, returning (path, file names, subdirectory paths)."""
+    files = []
+    subdirs = []
+    try:
+        with os.scandir(path) as it:
+            for e in it:
+                try:
+                    is_dir = e.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    # like os.walk, symlinked directories are not descended into
+                    if not e.is_symlink():
+                        subdirs.append(e.path)
+                else:
+                    files.append(e.name)
+    except OSError:
+        # like os.walk, silently skip directories that cannot be listed
+        return path, [], []
+    return path, files, subdirs
+
 
 if not SKILLS.exists():
     print('skills_db.json not found:', SKILLS)
@@ -27,12 +53,30 @@ for entry in skills:
 art_keys = list(dict.fromkeys(art_keys))
 print('Unique art_keys count:', len(art_keys))
 
-# build filename -> path map by walking ASSETS_ROOT
+# build filename -> path map (and stem -> [(suffix, path)] index) by walking ASSETS_ROOT
+# directory listings are syscall-bound (especially on NTFS), so scan several directories at once
 filename_map = {}
+by_stem = {}
 if ASSETS_ROOT.exists():
-    for root, dirs, files in os.walk(ASSETS_ROOT):
+    listings = []
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        pending = {ex.submit(scan_dir, str(ASSETS_ROOT))}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                root, files, subdirs = fut.result()
+                listings.append((root, files))
+                pending.update(ex.submit(scan_dir, d) for d in subdirs)
+    # merge in top-down order like os.walk (each directory, then its subtree; siblings by name) so the "first"
+    # match for a duplicate name is deterministic; sorting by path components keeps this the same on every platform,
+    # unlike comparing raw path strings
+    for root, files in sorted(listings, key=lambda listing: Path(listing[0]).parts):
         for fn in files:
-            filename_map.setdefault(fn.lower(), []).append(Path(root) / fn)
+            fn_lower = fn.lower()
+            path = Path(root) / fn
+            filename_map.setdefault(fn_lower, []).append(path)
+            stem, suffix = os.path.splitext(fn_lower)
+            by_stem.setdefault(stem, []).append((suffix, path))
 else:
     print('Assets root not found:', ASSETS_ROOT)
 
@@ -60,13 +104,10 @@ for ak in art_keys:
 
     # if base has no extension, try adding common extensions
     name_no_ext, ext = os.path.splitext(base)
+    needle = name_no_ext.lower()
+    same_stem = by_stem.get(needle, [])
     if ext == '':
-        matched = None
-        for ext_try in EXT_TRY:
-            cand = (name_no_ext + ext_try).lower()
-            if cand in filename_map:
-                matched = filename_map[cand][0]
-                break
+        matched = next((path for ext_try in EXT_TRY for suffix, path in same_stem if suffix == ext_try), None)
         if matched:
             try:
                 shutil.copy2(matched, DEST / matched.name)
@@ -78,11 +119,14 @@ for ak in art_keys:
                 continue
 
     # fallback: fuzzy contains search in filename_map keys
-    found_candidate = None
-    for fn_lower, paths in filename_map.items():
-        if name_no_ext.lower() in fn_lower:
-            found_candidate = paths[0]
-            break
+    # (filename_map already covers every file under ASSETS_ROOT, so no rescan is needed on a miss)
+    # an exact stem hit (any extension) short-circuits the substring scan
+    found_candidate = same_stem[0][1] if same_stem else None
+    if found_candidate is None:
+        for fn_lower, paths in filename_map.items():
+            if needle in fn_lower:
+                found_candidate = paths[0]
+                break
     if found_candidate:
         try:
             shutil.copy2(found_candidate, DEST / found_candidate.name)
@@ -93,24 +137,7 @@ for ak in art_keys:
             not_found.append((ak, 'copy_failed'))
             continue
 
-    # last resort: search whole tree for file name substring (costly)
-    searched = False
-    for root, dirs, files in os.walk(ASSETS_ROOT):
-        for fn in files:
-            if name_no_ext.lower() in fn.lower():
-                src = Path(root) / fn
-                try:
-                    shutil.copy2(src, DEST / src.name)
-                    found.append((ak, str(src)))
-                except Exception as e:
-                    print('Failed copy', src, e)
-                    not_found.append((ak, 'copy_failed'))
-                searched = True
-                break
-        if searched:
-            break
-    if not searched:
-        not_found.append((ak, 'not_found'))
+    not_found.append((ak, 'not_found'))
 
 print('\nSummary:')
 print('Total art_keys:', len(art_keys))
@@ -1,8 +1,17 @@
 import json
 import os
+import shutil
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 from PIL import Image
 from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# 复用同一个连接池，避免每个图标都重新建立 TCP/TLS 连接
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                                      max_retries=Retry(total=3, backoff_factor=0.5)))
 
 # 读取 event_encounters.json
 with open("../src-tauri/resources/event_encounters.json", 'r', encoding='utf-8') as f:
@@ -14,23 +23,53 @@ os.makedirs(icon_dir, exist_ok=True)
 
 # 收集所有需要下载的 icon_url
 icons_to_download = {}
+seen_urls = set()
 for event in events:
-    if 'choices' in event and event['choices']:
-        for choice in event['choices']:
-            if 'icon_url' in choice and choice['icon_url']:
-                icon_url = choice['icon_url']
-                # 从URL中提取文件名
-                icon_id = choice.get('icon', icon_url.split('/')[-1].split('.')[0])
-                if icon_id and icon_url not in icons_to_download.values():
-                    icons_to_download[icon_id] = icon_url
+    for choice in event.get('choices') or ():
+        icon_url = choice.get('icon_url')
+        if not icon_url:
+            continue
+        # 从URL中提取文件名
+        icon_id = choice.get('icon', icon_url.split('/')[-1].split('.')[0])
+        if icon_id and icon_url not in seen_urls:
+            icons_to_download[icon_id] = icon_url
+            seen_urls.add(icon_url)
 
 print(f"找到 {len(icons_to_download)} 个唯一的图标需要下载\n")
 
 # 下载图标
+def download_icon(icon_url, output_path):
+    """下载单个图标并保存为 WebP，返回错误信息（成功时为 None）"""
+    try:
+        with session.get(icon_url, timeout=10, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            
+            if response.headers.get('Content-Type', '').startswith('image/webp'):
+                # 源文件已是 WebP，直接落盘，无需解码再编码
+                tmp_path = output_path + '.part'
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        shutil.copyfileobj(response.raw, f)
+                    os.replace(tmp_path, output_path)
+                except Exception:
+                    # 写入中断时清理残留的 .part 文件
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            else:
+                # 解码并转换为 WebP
+                img = Image.open(BytesIO(response.content))
+                img.save(output_path, 'WEBP', quality=80)
+        return None
+    except Exception as e:
+        return str(e)
+
 downloaded = 0
 skipped = 0
 failed = []
 
+pending = {}
 for icon_id, icon_url in icons_to_download.items():
     output_path = os.path.join(icon_dir, f"{icon_id}.webp")
     
@@ -40,22 +79,24 @@ for icon_id, icon_url in icons_to_download.items():
         skipped += 1
         continue
     
-    try:
-        # 下载图片
-        print(f"下载 {icon_id} 从 {icon_url}...")
-        response = requests.get(icon_url, timeout=10)
-        response.raise_for_status()
-        
-        # 打开图片并转换为 WebP
-        img = Image.open(BytesIO(response.content))
-        img.save(output_path, 'WEBP', quality=80)
-        
-        print(f"  ✓ 已保存为 {output_path}")
-        downloaded += 1
-        
-    except Exception as e:
-        print(f"  ✗ 失败: {e}")
-        failed.append((icon_id, icon_url, str(e)))
+    pending[icon_id] = (icon_url, output_path)
+
+# 各图标互不依赖，并发下载（线程数不超过连接池大小）
+with ThreadPoolExecutor(max_workers=8) as executor:
+    futures = {
+        executor.submit(download_icon, icon_url, output_path): icon_id
+        for icon_id, (icon_url, output_path) in pending.items()
+    }
+    for future in as_completed(futures):
+        icon_id = futures[future]
+        icon_url, output_path = pending[icon_id]
+        error = future.result()
+        if error is None:
+            print(f"✓ {icon_id} 已保存为 {output_path}")
+            downloaded += 1
+        else:
+            print(f"✗ {icon_id} 失败: {error}")
+            failed.append((icon_id, icon_url, error))
 
 print("\n" + "="*80)
 print("下载完成！")
@@ -1,8 +1,16 @@
 import os
+import shutil
 import requests  # type: ignore
+from requests.adapters import HTTPAdapter  # type: ignore
+from urllib3.util.retry import Retry  # type: ignore
 from PIL import Image
 from io import BytesIO
 
+# 复用同一个连接池，避免每张图片都重新建立 TCP/TLS 连接
+session = requests.Session()
+session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=16,
+                                      max_retries=Retry(total=3, backoff_factor=0.5)))
+
 # 路径配置
 char_dir = "../src-tauri/resources/EncEvent_CHAR"
 bg_dir = "../src-tauri/resources/EncEvent_BG"
@@ -30,14 +38,27 @@ missing_images = {
 def download_image(url, save_path):
     """从URL下载图片并保存为WebP格式"""
     try:
-        response = requests.get(url, timeout=30)
-        response.raise_for_status()
-        
-        # 打开图片
-        img = Image.open(BytesIO(response.content))
-        
-        # 转换为WebP
-        img.save(save_path, 'WEBP', quality=80)
+        with session.get(url, timeout=30, stream=True) as response:
+            response.raise_for_status()
+            response.raw.decode_content = True
+            
+            if response.headers.get('Content-Type', '').startswith('image/webp'):
+                # 源文件已是 WebP，直接落盘，无需解码再编码
+                tmp_path = save_path + '.part'
+                try:
+                    with open(tmp_path, 'wb') as f:
+                        shutil.copyfileobj(response.raw, f)
+                    os.replace(tmp_path, save_path)
+                except Exception:
+                    # 写入中断时清理残留的 .part 文件
+                    if os.path.exists(tmp_path):
+                        os.remove(tmp_path)
+                    raise
+            else:
+                img = Image.open(BytesIO(response.content))
+                
+                # 转换为WebP
+                img.save(save_path, 'WEBP', quality=80)
         return True
     except Exception as e:
         print(f"  ✗ 下载失败: {e}")
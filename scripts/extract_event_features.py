@@ -1,78 +1,130 @@
+import argparse
 import json
 import cv2
+import numpy as np
 import os
-import base64
+from concurrent.futures import ProcessPoolExecutor
 
-# 读取 event_encounters.json
-with open("../src-tauri/resources/event_encounters.json", 'r', encoding='utf-8') as f:
-    events = json.load(f)
+# 每个工作进程持有自己的 ORB 检测器（OpenCL 模式下只在主进程中初始化）
+orb = None
+use_opencl = False
 
-# 初始化 ORB 检测器
-orb = cv2.ORB_create(nfeatures=500, scaleFactor=1.2, nlevels=8, edgeThreshold=15, firstLevel=0, WTA_K=2, scoreType=cv2.ORB_HARRIS_SCORE, patchSize=31, fastThreshold=20)
+def has_opencl():
+    """OpenCL 设备可用且 T-API 已启用"""
+    return cv2.ocl.haveOpenCL() and cv2.ocl.useOpenCL()
 
-print("开始提取事件图片特征...")
-print("="*80)
+def init_worker(opencl=False):
+    """初始化 ORB 检测器，opencl 为 True 时走 T-API (UMat) 加速"""
+    global orb, use_opencl
+    use_opencl = opencl
+    orb = cv2.ORB_create(nfeatures=500, scaleFactor=1.2, nlevels=8, edgeThreshold=15, firstLevel=0, WTA_K=2, scoreType=cv2.ORB_HARRIS_SCORE, patchSize=31, fastThreshold=20)
 
-updated_count = 0
-failed_list = []
+def extract(char_path):
+    """读取图片并提取 ORB 特征，返回 (descriptors, 特征点数量, 错误信息)"""
+    img = cv2.imread(char_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return None, 0, "无法读取图片"
+    
+    if use_opencl:
+        keypoints, descriptors = orb.detectAndCompute(cv2.UMat(img), None)
+        # 结果拷回内存
+        descriptors = descriptors.get() if descriptors is not None else None
+    else:
+        keypoints, descriptors = orb.detectAndCompute(img, None)
+    
+    if descriptors is None or len(descriptors) == 0:
+        return None, 0, "未检测到ORB特征"
+    
+    return descriptors, len(keypoints), None
 
-for event in events:
-    if 'image_paths' in event and event['image_paths'].get('char'):
-        char_path = os.path.join("../src-tauri/resources", event['image_paths']['char'])
+def extract_event_features(opencl=False):
+    # 读取 event_encounters.json
+    with open("../src-tauri/resources/event_encounters.json", 'r', encoding='utf-8') as f:
+        events = json.load(f)
+    
+    print("开始提取事件图片特征...")
+    print("="*80)
+    
+    updated_count = 0
+    failed_list = []
+    
+    # 收集需要提取特征的事件
+    jobs = []
+    for event in events:
+        image_paths = event.get('image_paths') or {}
+        if not image_paths.get('char'):
+            continue
+        
+        char_path = os.path.join("../src-tauri/resources", image_paths['char'])
         
         # 提取事件名称
-        name = None
-        if 'Localization' in event and 'Title' in event['Localization']:
-            name = event['Localization']['Title'].get('Text', '')
-        if not name:
-            name = event.get('InternalName', '')
+        title = (event.get('Localization') or {}).get('Title') or {}
+        name = title.get('Text', '') or event.get('InternalName', '')
         
-        # 读取图片
         if not os.path.exists(char_path):
             print(f"✗ {name}: 图片不存在 {char_path}")
             failed_list.append((name, "图片文件不存在"))
             continue
         
-        img = cv2.imread(char_path, cv2.IMREAD_GRAYSCALE)
-        if img is None:
-            print(f"✗ {name}: 无法读取图片")
-            failed_list.append((name, "无法读取图片"))
-            continue
-        
-        # 提取 ORB 特征
-        keypoints, descriptors = orb.detectAndCompute(img, None)
-        
-        if descriptors is None or len(descriptors) == 0:
-            print(f"✗ {name}: 未检测到特征")
-            failed_list.append((name, "未检测到ORB特征"))
+        jobs.append((event, event.get('Id') or name, name, char_path))
+    
+    # 描述子单独存放在二进制 npz 中，JSON 里只保留索引信息
+    all_descriptors = {}
+    
+    # UMat 路径的 ORB 结果与 CPU 版不完全一致，只在显式指定 --opencl 时启用；
+    # OpenCL 设备只有一个，在主进程中串行提交；CPU 下各图片互不依赖，分发到多个进程
+    use_opencl_path = opencl and has_opencl()
+    if opencl and not use_opencl_path:
+        print("警告: OpenCL 不可用，改用 CPU")
+    char_paths = [char_path for _, _, _, char_path in jobs]
+    if use_opencl_path:
+        init_worker(opencl=True)
+        results = [extract(char_path) for char_path in char_paths]
+    else:
+        with ProcessPoolExecutor(initializer=init_worker) as executor:
+            results = list(executor.map(extract, char_paths, chunksize=8))
+    
+    for (event, key, name, _), (descriptors, keypoints_count, error) in zip(jobs, results):
+        if error:
+            print(f"✗ {name}: {error}")
+            failed_list.append((name, error))
             continue
         
-        # 将特征转换为 base64 字符串
-        descriptor_bytes = descriptors.tobytes()
-        descriptor_b64 = base64.b64encode(descriptor_bytes).decode('utf-8')
+        all_descriptors[key] = descriptors
         
         # 保存到事件对象
         event['orb_features'] = {
-            'descriptors': descriptor_b64,
+            'npz_key': key,
             'shape': descriptors.shape,  # (num_keypoints, 32)
-            'keypoints_count': len(keypoints)
+            'keypoints_count': keypoints_count
         }
         
         updated_count += 1
-        print(f"✓ {name}: {len(keypoints)} 个特征点")
-
-print("\n" + "="*80)
-print("特征提取完成！")
-print(f"  ✓ 成功: {updated_count}")
-print(f"  ✗ 失败: {len(failed_list)}")
-
-if failed_list:
-    print("\n失败列表：")
-    for name, reason in failed_list:
-        print(f"  - {name}: {reason}")
-
-# 保存更新后的 JSON
-with open("../src-tauri/resources/event_encounters.json", 'w', encoding='utf-8') as f:
-    json.dump(events, f, ensure_ascii=False, indent=2)
+        print(f"✓ {name}: {keypoints_count} 个特征点")
+    
+    print("\n" + "="*80)
+    print("特征提取完成！")
+    print(f"  ✓ 成功: {updated_count}")
+    print(f"  ✗ 失败: {len(failed_list)}")
+    
+    if failed_list:
+        print("\n失败列表：")
+        for name, reason in failed_list:
+            print(f"  - {name}: {reason}")
+    
+    # 保存描述子（np.load(...)[npz_key] 即可读取）
+    np.savez("../src-tauri/resources/event_features.npz", **all_descriptors)
+    print("\n✓ 描述子已保存到 event_features.npz")
+    
+    # 保存更新后的 JSON
+    with open("../src-tauri/resources/event_encounters.json", 'w', encoding='utf-8') as f:
+        json.dump(events, f, ensure_ascii=False, indent=2)
+    
+    print("✓ 已保存到 event_encounters.json")
 
-print("\n✓ 已保存到 event_encounters.json")
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--opencl', action='store_true',
+                    help='run ORB serially on OpenCL UMat (output differs slightly from the default CPU process pool)')
+    args = ap.parse_args()
+    extract_event_features(opencl=args.opencl)
@@ -1,6 +1,7 @@
 import json
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # 路径配置
 event_json_path = "../src-tauri/resources/event_encounters.json"
@@ -8,6 +9,9 @@ source_assets_dir = r"D:\TheBazaarData\Assets"
 target_char_dir = "../src-tauri/resources/EncEvent_CHAR"
 target_bg_dir = "../src-tauri/resources/EncEvent_BG"
 
+# 清理事件名称时需要删除的字符（单引号、空格）
+CLEAN_NAME_TABLE = str.maketrans('', '', "' ")
+
 # 创建目标文件夹
 os.makedirs(target_char_dir, exist_ok=True)
 os.makedirs(target_bg_dir, exist_ok=True)
@@ -19,91 +23,94 @@ with open(event_json_path, 'r', encoding='utf-8') as f:
 # 提取有 choices 的事件名称
 event_names = []
 for event in events:
-    if 'choices' in event and event['choices']:
-        # 尝试多个来源获取名称
-        name = None
-        clean_name = None
-        
-        # 优先使用 Localization.Title.Text
-        if 'Localization' in event and 'Title' in event['Localization']:
-            name = event['Localization']['Title'].get('Text', '')
-        
-        # 如果没有，使用 InternalName
-        if not name:
-            name = event.get('InternalName', '')
-        
-        # 最后尝试 name 字段
-        if not name:
-            name = event.get('name', '')
-            
-        if name:
-            # 去掉括号及其内容和前面的空格
-            clean_name = name.split(' (')[0].strip()
-            # 处理特殊字符（如单引号、空格等）
-            # 移除特殊符号，保留字母数字
-            clean_name = clean_name.replace("'", "").replace(" ", "")
-            event_names.append((name, clean_name))
+    if not event.get('choices'):
+        continue
+    
+    # 尝试多个来源获取名称：优先 Localization.Title.Text，其次 InternalName，最后 name 字段
+    title = (event.get('Localization') or {}).get('Title') or {}
+    name = title.get('Text', '') or event.get('InternalName', '') or event.get('name', '')
+    
+    if name:
+        # 去掉括号及其内容和前面的空格
+        clean_name = name.split(' (', 1)[0].strip()
+        # 处理特殊字符（如单引号、空格等）
+        # 移除特殊符号，保留字母数字
+        clean_name = clean_name.translate(CLEAN_NAME_TABLE)
+        event_names.append((name, clean_name))
 
 print(f"找到 {len(event_names)} 个包含 choices 的事件")
 
+# 构造期望的文件名（支持多种大小写变体和前缀）
+prefixes = ["ENC_Merchant_", "ENC_Event_"]
+char_suffixes = ["_Char.png", "_CHAR.png", "_char.png"]
+bg_suffixes = ["_Bg.png", "_BG.png", "_bg.png"]
+
+event_patterns = []
+wanted_files = set()
+for original_name, clean_name in event_names:
+    char_patterns = [f"{prefix}{clean_name}{suffix}" for prefix in prefixes for suffix in char_suffixes]
+    bg_patterns = [f"{prefix}{clean_name}{suffix}" for prefix in prefixes for suffix in bg_suffixes]
+    event_patterns.append((original_name, clean_name, char_patterns, bg_patterns))
+    wanted_files.update(char_patterns)
+    wanted_files.update(bg_patterns)
+
+# 只遍历一次 Assets 目录，只记录需要的文件
+asset_index = {}
+for root, dirs, files in os.walk(source_assets_dir):
+    for file in files:
+        if file in wanted_files:
+            asset_index.setdefault(file, os.path.join(root, file))
+
 # 查找并复制图片
 found_char = []
 found_bg = []
 missing_char = []
 missing_bg = []
+failed_copy = []
+# 目标路径 -> (源路径, 类型, 源文件名, 目标文件名)；名称只有括号后缀不同的事件会得到同一个目标，只复制一次
+copies = {}
+copy_events = {}
 
-for original_name, clean_name in event_names:
-    # 构造期望的文件名模式（支持多种大小写变体和前缀）
-    prefixes = ["ENC_Merchant_", "ENC_Event_"]
-    char_patterns = []
-    bg_patterns = []
-    
-    for prefix in prefixes:
-        char_patterns.extend([
-            f"{prefix}{clean_name}_Char.png",
-            f"{prefix}{clean_name}_CHAR.png",
-            f"{prefix}{clean_name}_char.png",
-        ])
-        bg_patterns.extend([
-            f"{prefix}{clean_name}_Bg.png",
-            f"{prefix}{clean_name}_BG.png",
-            f"{prefix}{clean_name}_bg.png",
-        ])
-    
-    # 在 Assets 目录下搜索
-    char_found = False
-    bg_found = False
-    
-    for root, dirs, files in os.walk(source_assets_dir):
-        for file in files:
-            # 检查是否匹配任何 Char 模式
-            if any(file == pattern for pattern in char_patterns):
-                src_path = os.path.join(root, file)
-                # 统一保存为标准命名格式
-                dst_filename = f"ENC_Merchant_{clean_name}_Char.png"
-                dst_path = os.path.join(target_char_dir, dst_filename)
-                shutil.copy2(src_path, dst_path)
-                found_char.append((original_name, file))
-                char_found = True
-                print(f"✓ 复制 Char: {file} -> {dst_filename}")
-            
-            # 检查是否匹配任何 Bg 模式
-            elif any(file == pattern for pattern in bg_patterns):
-                src_path = os.path.join(root, file)
-                # 统一保存为标准命名格式
-                dst_filename = f"ENC_Merchant_{clean_name}_Bg.png"
-                dst_path = os.path.join(target_bg_dir, dst_filename)
-                shutil.copy2(src_path, dst_path)
-                found_bg.append((original_name, file))
-                bg_found = True
-                print(f"✓ 复制 Bg: {file} -> {dst_filename}")
-    
-    if not char_found:
+for original_name, clean_name, char_patterns, bg_patterns in event_patterns:
+    # 在索引中查找 Char 图片
+    char_file = next((p for p in char_patterns if p in asset_index), None)
+    if char_file:
+        # 统一保存为标准命名格式
+        dst_filename = f"ENC_Merchant_{clean_name}_Char.png"
+        dst_path = os.path.join(target_char_dir, dst_filename)
+        copies[dst_path] = (asset_index[char_file], "Char", char_file, dst_filename)
+        copy_events.setdefault(dst_path, []).append(original_name)
+    else:
         missing_char.append((original_name, char_patterns[0]))
     
-    if not bg_found:
+    # 在索引中查找 Bg 图片
+    bg_file = next((p for p in bg_patterns if p in asset_index), None)
+    if bg_file:
+        # 统一保存为标准命名格式
+        dst_filename = f"ENC_Merchant_{clean_name}_Bg.png"
+        dst_path = os.path.join(target_bg_dir, dst_filename)
+        copies[dst_path] = (asset_index[bg_file], "Bg", bg_file, dst_filename)
+        copy_events.setdefault(dst_path, []).append(original_name)
+    else:
         missing_bg.append((original_name, bg_patterns[0]))
 
+# 并发执行文件复制（copies 按目标路径去重，各任务写入不同文件），完成一个报告一个
+with ThreadPoolExecutor(max_workers=8) as executor:
+    futures = {executor.submit(shutil.copy2, src_path, dst_path): dst_path for dst_path, (src_path, _, _, _) in copies.items()}
+    for future in as_completed(futures):
+        dst_path = futures[future]
+        _, kind, src_file, dst_filename = copies[dst_path]
+        names = copy_events[dst_path]
+        try:
+            future.result()
+        except OSError as e:
+            print(f"✗ 复制 {kind} 失败: {src_file} -> {dst_filename} ({e})")
+            failed_copy.extend((name, src_file, str(e)) for name in names)
+            continue
+        found = found_char if kind == "Char" else found_bg
+        found.extend((name, src_file) for name in names)
+        print(f"✓ 复制 {kind}: {src_file} -> {dst_filename}")
+
 # 输出统计
 print("\n" + "="*60)
 print("统计结果:")
@@ -111,6 +118,7 @@ print(f"  找到 Char 图片: {len(found_char)} 个")
 print(f"  找到 Bg 图片: {len(found_bg)} 个")
 print(f"  缺失 Char 图片: {len(missing_char)} 个")
 print(f"  缺失 Bg 图片: {len(missing_bg)} 个")
+print(f"  复制失败: {len(failed_copy)} 个")
 
 if missing_char:
     print("\n缺失的 Char 图片:")
@@ -122,4 +130,9 @@ if missing_bg:
     for orig_name, pattern in missing_bg:
         print(f"  - {orig_name} (期望: {pattern})")
 
+if failed_copy:
+    print("\n复制失败的图片:")
+    for orig_name, src_file, reason in failed_copy:
+        print(f"  - {orig_name} ({src_file}: {reason})")
+
 print("\n完成！")
@@ -1,6 +1,8 @@
+import argparse
 import json
 import os
 import struct
+from concurrent.futures import ProcessPoolExecutor
 
 try:
     import cv2
@@ -11,16 +13,76 @@ except ImportError:
     print("警告: 未安装opencv-python，将跳过特征生成")
     print("请运行: pip install opencv-python")
 
+# 预编译的 bincode 定长字段格式
+_U64 = struct.Struct('<Q')
+_I32 = struct.Struct('<i')
+
 def pack_string(s):
     """Bincode string serialization: len(u64) + bytes"""
     encoded = s.encode('utf-8')
-    return struct.pack('<Q', len(encoded)) + encoded
+    return _U64.pack(len(encoded)) + encoded
 
 def pack_vec_u8(data):
     """Bincode Vec<u8> serialization: len(u64) + bytes"""
-    return struct.pack('<Q', len(data)) + data
+    return _U64.pack(len(data)) + data
+
+def has_cuda():
+    """是否有可用的 CUDA 设备"""
+    return hasattr(cv2, 'cuda') and cv2.cuda.getCudaEnabledDeviceCount() > 0
+
+def create_orb(use_cuda=False):
+    """创建 ORB 检测器：use_cuda 时使用 cv2.cuda_ORB，否则使用 CPU 版本"""
+    params = dict(
+        nfeatures=500,
+        scaleFactor=1.2,
+        nlevels=8,
+        edgeThreshold=15,
+        firstLevel=0,
+        WTA_K=2,
+        scoreType=cv2.ORB_HARRIS_SCORE,
+        patchSize=31,
+        fastThreshold=20
+    )
+    if use_cuda:
+        # CPU 版 ORB 计算描述子前会做高斯模糊，CUDA 版默认关闭；
+        # 运行时用 CPU ORB 匹配这些模板，必须保持一致
+        return cv2.cuda_ORB.create(**params, blurForDescriptor=True)
+    return cv2.ORB_create(**params)
+
+def detect_and_compute(orb, use_cuda, img):
+    """提取 ORB 特征，CUDA 模式下上传到显存计算后再下载描述子"""
+    if not use_cuda:
+        return orb.detectAndCompute(img, None)
+    gpu_img = cv2.cuda_GpuMat()
+    gpu_img.upload(img)
+    gpu_keypoints, gpu_descriptors = orb.detectAndComputeAsync(gpu_img, None)
+    keypoints = orb.convert(gpu_keypoints)
+    descriptors = None if gpu_descriptors.empty() else gpu_descriptors.download()
+    return keypoints, descriptors
+
+def extract(orb, use_cuda, char_path):
+    """读取图片并提取 ORB 特征，返回 (特征点数量, descriptors, 错误信息)"""
+    img = cv2.imread(char_path, cv2.IMREAD_GRAYSCALE)
+    if img is None:
+        return 0, None, "无法读取图片"
+    
+    keypoints, descriptors = detect_and_compute(orb, use_cuda, img)
+    if descriptors is None or len(descriptors) == 0:
+        return 0, None, "未检测到ORB特征"
+    
+    return len(keypoints), descriptors, None
+
+# 进程池中每个工作进程各自持有一个 CPU ORB 检测器
+_worker_orb = None
+
+def init_worker():
+    global _worker_orb
+    _worker_orb = create_orb()
+
+def extract_in_worker(char_path):
+    return extract(_worker_orb, False, char_path)
 
-def generate_event_features():
+def generate_event_features(cuda=False):
     """为所有事件图片生成单一的ORB特征bin文件 (event_features_opencv.bin)"""
     if not HAS_CV2:
         print("无法生成特征文件，缺少opencv-python")
@@ -37,31 +99,23 @@ def generate_event_features():
     # 目标文件路径
     output_path = os.path.join(resources_dir, "event_features_opencv.bin")
     
-    # 初始化 ORB 检测器
-    orb = cv2.ORB_create(
-        nfeatures=500,
-        scaleFactor=1.2,
-        nlevels=8,
-        edgeThreshold=15,
-        firstLevel=0,
-        WTA_K=2,
-        scoreType=cv2.ORB_HARRIS_SCORE,
-        patchSize=31,
-        fastThreshold=20
-    )
+    # CUDA ORB 的检测/筛选实现与 CPU 版不同，生成的模板与运行时的 CPU 描述子不完全一致，
+    # 因此只在显式指定 --cuda 时启用，发布用的 bin 文件应使用默认的 CPU 路径生成
+    use_cuda = cuda and has_cuda()
+    if cuda and not use_cuda:
+        print("警告: 未检测到可用的 CUDA 设备，改用 CPU")
     
-    print("开始生成事件特征文件...")
+    print(f"开始生成事件特征文件... ({'CUDA' if use_cuda else 'CPU'})")
     print("="*80)
     
     generated_count = 0
     failed_list = []
     
-    # 收集所有模板数据
-    temp_buffer = bytearray()
-    valid_events_count = 0
-    
+    # 收集需要提取特征的事件
+    jobs = []
     for event in events:
-        if 'image_paths' not in event or not event['image_paths'].get('char'):
+        image_paths = event.get('image_paths') or {}
+        if not image_paths.get('char'):
             continue
         
         # 获取事件ID
@@ -69,37 +123,40 @@ def generate_event_features():
         if not event_id:
             continue
         
-        char_path = os.path.join(resources_dir, event['image_paths']['char'])
+        char_path = os.path.join(resources_dir, image_paths['char'])
         
         # 提取事件名称
-        name = None
-        if 'Localization' in event and 'Title' in event['Localization']:
-            name = event['Localization']['Title'].get('Text', '')
-        if not name:
-            name = event.get('InternalName', event_id)
+        title = (event.get('Localization') or {}).get('Title') or {}
+        name = title.get('Text', '') or event.get('InternalName', event_id)
         
-        # 读取图片
         if not os.path.exists(char_path):
             print(f"✗ {name}: 图片不存在 {char_path}")
             failed_list.append((name, "图片文件不存在"))
             continue
         
-        img = cv2.imread(char_path, cv2.IMREAD_GRAYSCALE)
-        if img is None:
-            print(f"✗ {name}: 无法读取图片")
-            failed_list.append((name, "无法读取图片"))
-            continue
-        
-        # 提取 ORB 特征
-        keypoints, descriptors = orb.detectAndCompute(img, None)
-        
-        if descriptors is None or len(descriptors) == 0:
-            print(f"✗ {name}: 未检测到特征")
-            failed_list.append((name, "未检测到ORB特征"))
+        jobs.append((event_id, name, char_path))
+    
+    # 提取 ORB 特征：GPU 只有一个上下文，串行提交；CPU 下各图片互不依赖，分发到多个进程
+    char_paths = [char_path for _, _, char_path in jobs]
+    if use_cuda:
+        orb = create_orb(use_cuda=True)
+        results = [extract(orb, True, char_path) for char_path in char_paths]
+    else:
+        with ProcessPoolExecutor(initializer=init_worker) as executor:
+            results = list(executor.map(extract_in_worker, char_paths, chunksize=8))
+    
+    # 收集所有模板数据，最后一次性拼接写入
+    chunks = []
+    valid_events_count = 0
+    
+    for (event_id, name, _), (keypoints_count, descriptors, error) in zip(jobs, results):
+        if error:
+            print(f"✗ {name}: {error}")
+            failed_list.append((name, error))
             continue
             
         generated_count += 1
-        print(f"✓ {name}: 生成特征 ({len(keypoints)} 个特征点)")
+        print(f"✓ {name}: 生成特征 ({keypoints_count} 个特征点)")
         
         # 序列化单个 EventTemplateCache 结构
         # struct EventTemplateCache {
@@ -110,21 +167,17 @@ def generate_event_features():
         #     descriptor_cols: i32,
         # }
         
-        item_data = bytearray()
-        item_data.extend(pack_string(event_id))
-        item_data.extend(pack_string(name))
-        item_data.extend(pack_vec_u8(descriptors.tobytes()))
-        item_data.extend(struct.pack('<i', descriptors.shape[0])) # rows
-        item_data.extend(struct.pack('<i', descriptors.shape[1])) # cols
-        
-        temp_buffer.extend(item_data)
+        chunks.append(pack_string(event_id))
+        chunks.append(pack_string(name))
+        chunks.append(pack_vec_u8(descriptors.tobytes()))
+        chunks.append(_I32.pack(descriptors.shape[0])) # rows
+        chunks.append(_I32.pack(descriptors.shape[1])) # cols
         valid_events_count += 1
         
     # 最终写入文件
     # Vec<EventTemplateCache> 序列化: [len: u64] [item1] [item2] ...
     with open(output_path, 'wb') as f:
-        f.write(struct.pack('<Q', valid_events_count))
-        f.write(temp_buffer)
+        f.write(b''.join([_U64.pack(valid_events_count)] + chunks))
         
     print("\n" + "="*80)
     print("特征生成完成！")
@@ -139,4 +192,8 @@ def generate_event_features():
     print(f"\n单一特征文件保存在: {output_path}")
 
 if __name__ == "__main__":
-    generate_event_features()
+    ap = argparse.ArgumentParser()
+    ap.add_argument('--cuda', action='store_true',
+                    help='use cv2.cuda_ORB (experimental; output differs from the CPU ORB used at runtime)')
+    args = ap.parse_args()
+    generate_event_features(cuda=args.cuda)